@@ -1,8 +1,10 @@
+import os
 import sys
+import threading
 import time
 from typing import Any, TypedDict
 import requests
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QObject, QTimer, Signal, Slot
 from PySide6.QtGui import QFont, QGuiApplication
 from PySide6.QtWidgets import (
     QDialog, QLineEdit, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QLabel,
@@ -12,6 +14,19 @@ from PySide6.QtWidgets import (
 CLIENT_ID: str = 'Iv23lixE9BO6XLUTLthN'
 CODE_URL: str = 'https://github.com/login/device/code'
 TOKEN_URL: str = 'https://github.com/login/oauth/access_token'
+TOKEN_FILE: str = 'github.token'
+
+def readToken() -> str | None:
+    try:
+        with open(TOKEN_FILE, 'r') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def writeToken(token: str) -> None:
+    fd = os.open(TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, 'w') as f:
+        f.write(token)
 
 class AuthDialog(QDialog):
 
@@ -35,15 +50,14 @@ class AuthDialog(QDialog):
         layout.addWidget(copy, 0)
         row.setLayout(layout)
 
-        ok = QPushButton('Done')
-        ok.clicked.connect(self.accept)
+        status = QLabel('Waiting for authorization on GitHub...')
         cancel = QPushButton('Cancel')
         cancel.clicked.connect(self.reject)
 
         buttons = QWidget(self)
         layout = QHBoxLayout(buttons)
-        layout.addWidget(ok)
-        layout.addWidget(cancel)
+        layout.addWidget(status, 1)
+        layout.addWidget(cancel, 0)
         buttons.setLayout(layout)
 
         layout = QVBoxLayout(self)
@@ -57,8 +71,84 @@ class AuthDialog(QDialog):
     def doCopy(self, code: str) -> None:
         QGuiApplication.clipboard().setText(code)
 
+class TokenPoller(QObject):
+
+    succeeded = Signal()
+    failed = Signal()
+    _polled = Signal(object) # token response, or the exception raised
+
+    token: str | None = None
+    error: str | None = None
+    stopped: bool = False
+
+    def __init__(self, deviceCode: str, interval: int, expiresIn: int) -> None:
+        super().__init__()
+
+        self.deviceCode = deviceCode
+        self.interval = interval
+        self.deadline = time.monotonic() + expiresIn
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.poll)
+        self._polled.connect(self._handle)
+
+    @Slot()
+    def start(self) -> None:
+        self.timer.start(self.interval * 1000)
+
+    @Slot()
+    def stop(self) -> None:
+        # an in-flight request is left to finish on its daemon thread
+        self.stopped = True
+        self.timer.stop()
+
+    @Slot()
+    def poll(self) -> None:
+        if time.monotonic() >= self.deadline:
+            self.error = 'expired_token'
+            self.failed.emit()
+            return
+        threading.Thread(target=self._request, daemon=True).start()
+
+    def _request(self) -> None:
+        try:
+            r = requests.post(TOKEN_URL, data=dict(
+                client_id=CLIENT_ID,
+                device_code=self.deviceCode,
+                grant_type='urn:ietf:params:oauth:grant-type:device_code'
+            ), headers={'Accept': 'application/json'}, timeout=self.interval)
+            r.raise_for_status()
+            self._polled.emit(r.json())
+        except requests.RequestException as e:
+            self._polled.emit(e)
+
+    @Slot(object)
+    def _handle(self, data: dict[str, Any] | requests.RequestException) -> None:
+        if self.stopped:
+            return
+        if isinstance(data, requests.Timeout):
+            self.timer.start(self.interval * 1000)
+            return
+        if isinstance(data, requests.RequestException):
+            self.error = str(data)
+            self.failed.emit()
+            return
+        error = data.get('error')
+        if error == 'slow_down':
+            self.interval = int(data.get('interval', self.interval + 5))
+        elif error is None:
+            self.token = data['access_token']
+            self.succeeded.emit()
+            return
+        elif error != 'authorization_pending':
+            self.error = error
+            self.failed.emit()
+            return
+        self.timer.start(self.interval * 1000)
+
 class TreeItem(TypedDict):
     path: str
+    sha: str
     url: str
 
 class TreeSha(TypedDict):
@@ -85,34 +175,43 @@ class GitHub:
         self.urlContents = {}
         self.branchCommits = {}
 
+    def __getstate__(self) -> dict[str, Any]:
+        # the token lives in TOKEN_FILE, not in the content cache
+        state = self.__dict__.copy()
+        state.pop('token', None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        token = state.pop('token', None)
+        self.__dict__.update(state)
+        if token is not None and readToken() is None:
+            writeToken(token) # migrate from caches that still hold a token
+
     def getToken(self) -> str:
+        if self.token is None:
+            self.token = readToken()
         if self.token is not None:
             return self.token
         r = requests.post(CODE_URL, data={'client_id': CLIENT_ID}, headers={'Accept': 'application/json'})
         r.raise_for_status()
         data = r.json()
-        device_code = data['device_code']
         dialog = AuthDialog(data['verification_uri'], data['user_code'])
+        poller = TokenPoller(data['device_code'], int(data.get('interval', 5)),
+                             int(data.get('expires_in', 900)))
+        poller.succeeded.connect(dialog.accept)
+        poller.failed.connect(dialog.reject)
+        dialog.finished.connect(poller.stop)
+        poller.start()
         result = dialog.exec()
-        if result != QDialog.DialogCode.Accepted: # user cancelled
-            sys.exit(1)
-        data = {'error': 'authorization_pending'}
-        while data.get('error') == 'authorization_pending':
-            r = requests.post(TOKEN_URL, data=dict(
-                client_id=CLIENT_ID,
-                device_code=device_code,
-                grant_type='urn:ietf:params:oauth:grant-type:device_code'
-            ), headers={'Accept': 'application/json'})
-            r.raise_for_status()
-            data = r.json()
-        if 'error' in data:
+        if poller.error is not None:
             QMessageBox.critical(dialog, 'GitHub Authentication Failed',
-                                 f'GitHub error: {data["error"]!r}')
-            sys.exit(data['error'])
-        self.token = data['access_token']
-        with open('github.pickle', 'wb') as f:
-            pickle.dump(self, f)
-        return data['access_token']
+                                 f'GitHub error: {poller.error!r}')
+            sys.exit(poller.error)
+        if result != QDialog.DialogCode.Accepted or poller.token is None: # user cancelled
+            sys.exit(1)
+        self.token = poller.token
+        writeToken(self.token)
+        return self.token
 
     def _getGitHub(self, repo: str, path: str, json: bool = True) -> Any:
         r = requests.get(f'https://api.github.com/repos/{repo}{path}', headers={
@@ -2,7 +2,7 @@ import sys
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QApplication, QWidget, QHBoxLayout, QVBoxLayout, QLabel, QFileDialog,
-    QTableView, QPushButton, QStyleFactory, QHeaderView
+    QTableView, QPushButton, QStyleFactory, QHeaderView, QMessageBox
 )
 
 from github import gh
@@ -12,6 +12,9 @@ from model import (
 )
 
 FILTER = 'JSON Files (*.json)'
+RENUMBERING_HELP = ('An amendment whose proposed text starts with an empty line deletes its item. '
+                    'Each further proposed line starting with & inserts a new item after it, '
+                    'nested by the number of &. All amendments to a file are checked together.')
 
 class AmendmentsView(QTableView):
     def __init__(self) -> None:
@@ -45,11 +48,16 @@ class Amender(QWidget):
         delButton.clicked.connect(self.delAmendment)
         sortButton = QPushButton('Sort')
         sortButton.clicked.connect(self.sortAmendments)
+        refsButton = QPushButton('Check References')
+        refsButton.setToolTip(RENUMBERING_HELP)
+        refsButton.setEnabled(False)
+        refsButton.clicked.connect(self.checkReferences)
 
         buttonLayout = QHBoxLayout()
         buttonLayout.addWidget(addButton)
         buttonLayout.addWidget(delButton)
         buttonLayout.addWidget(sortButton)
+        buttonLayout.addWidget(refsButton)
 
         self.amendmentsView = AmendmentsView()
         self.amendmentsView.setModel(self.amendmentsModel)
@@ -60,6 +68,8 @@ class Amender(QWidget):
         self.amendmentsModel.dataChanged.connect(self.amendmentsView.resizeRowsToContents)
 
         self.addAmendment()
+        self.amendmentsModel.indexed.connect(lambda: refsButton.setEnabled(True))
+        self.amendmentsModel.buildIndex()
 
         openButton = QPushButton('Open')
         openButton.clicked.connect(self.openAmendments)
@@ -107,6 +117,20 @@ class Amender(QWidget):
         self.amendmentsModel.naturalSort()
         self._resize()
 
+    def checkReferences(self) -> None:
+        impact, problems = self.amendmentsModel.renumberingImpact()
+        paragraphs = [
+            f'Amendments to {path} renumber sections cited by:\n' + '\n'.join(citing)
+            for path, citing in impact.items()
+        ]
+        if problems:
+            paragraphs.append('\n'.join(problems))
+        if not paragraphs:
+            QMessageBox.information(self, 'Check References',
+                                    'No other clauses cite renumbered sections.\n\n' + RENUMBERING_HELP)
+            return
+        QMessageBox.warning(self, 'Check References', '\n\n'.join(paragraphs + [RENUMBERING_HELP]))
+
     def _resize(self) -> None:
         self.amendmentsView.resizeColumnToContents(0)
         self.amendmentsView.resizeColumnToContents(1)
@@ -132,6 +156,7 @@ if __name__ == '__main__':
     app = QApplication(sys.argv)
     QApplication.setStyle(QStyleFactory.create('Fusion'))
     widget = Amender()
+    app.aboutToQuit.connect(widget.amendmentsModel.stopIndexing)
     widget.show()
     try:
         sys.exit(app.exec())
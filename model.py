@@ -3,7 +3,7 @@ import re
 from typing import cast
 from PySide6.QtCore import (
     QAbstractItemModel, QAbstractTableModel, QModelIndex,
-    QPersistentModelIndex, Qt
+    QPersistentModelIndex, Qt, QObject, QThread, Signal, Slot
 )
 from PySide6.QtWidgets import (
     QStyledItemDelegate, QComboBox, QWidget, QStyleOptionViewItem, QLineEdit,
@@ -11,9 +11,10 @@ from PySide6.QtWidgets import (
 )
 import docx
 import docx.shared
+import requests
 
-from github import gh
-from str_manip import TeXSource, SectionValidator
+from github import gh, TreeItem
+from str_manip import TeXSource, SectionValidator, CrossReferenceIndex, Section
 
 ROLES = {
     Qt.ItemDataRole.DisplayRole,
@@ -66,15 +67,53 @@ class ProposedAmendmentDelegate(QStyledItemDelegate):
     def setModelData(self, box: QTextEdit, model: QAbstractItemModel, index: QModelIndex | QPersistentModelIndex) -> None:
         model.setData(index, box.toPlainText(), Qt.ItemDataRole.EditRole)
 
+class IndexBuilder(QObject):
+
+    # only the GUI thread touches the index, so parses are handed back
+    parsed = Signal(str, str, object)
+    failed = Signal(str, str)
+    finished = Signal()
+
+    def __init__(self, items: list[TreeItem]) -> None:
+        super().__init__()
+
+        self.items = items
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            for item in self.items:
+                if QThread.currentThread().isInterruptionRequested():
+                    break
+                try:
+                    tex = TeXSource(gh.getBlob(item['url']))
+                except requests.RequestException as e:
+                    self.failed.emit(item['path'], str(e))
+                    continue
+                self.parsed.emit(item['path'], item['sha'], tex)
+        finally:
+            self.finished.emit()
+
 class AmendmentsModel(QAbstractTableModel):
 
+    indexed = Signal()
+
     sources: dict[str, TeXSource]
+    xrefs: CrossReferenceIndex
+    indexErrors: list[str]
+    indexBuilder: IndexBuilder | None = None
+    indexThread: QThread | None = None
 
     def __init__(self) -> None:
         super().__init__()
 
         self.amendments: list[list[str]] = []
         self.sources = {}
+        self.xrefs = CrossReferenceIndex()
+        self.indexErrors = []
+
+    def _parse(self, item: TreeItem) -> TeXSource:
+        return self.xrefs.add(item['path'], item['sha'], lambda: gh.getBlob(item['url']))
 
     def source(self, which: str | QModelIndex | QPersistentModelIndex) -> TeXSource:
         if isinstance(which, str):
@@ -82,10 +121,67 @@ class AmendmentsModel(QAbstractTableModel):
         else:
             path = self.amendments[which.row()][0]
         if path not in self.sources:
-            gh.getTree('skule/bylaws')
-            self.sources[path] = TeXSource(gh.getBlob(str(gh.repoPathUrls['skule/bylaws'][path])))
+            for item in gh.getTree('skule/bylaws'):
+                if item['path'] == path:
+                    self.sources[path] = self._parse(item)
+                    break
         return self.sources[path]
 
+    def buildIndex(self) -> None:
+        gh.getToken() # may need to log in, which can only happen on this thread
+        pending = [item for item in gh.getTree('skule/bylaws') if item['path'].endswith('.tex')]
+        self.indexBuilder = IndexBuilder(pending)
+        self.indexThread = QThread()
+        self.indexBuilder.moveToThread(self.indexThread)
+        self.indexThread.started.connect(self.indexBuilder.run)
+        self.indexBuilder.parsed.connect(self._indexParsed)
+        self.indexBuilder.failed.connect(self._indexFailed)
+        self.indexBuilder.finished.connect(self.indexThread.quit)
+        self.indexBuilder.finished.connect(self.indexed)
+        self.indexThread.start()
+
+    @Slot(str, str, object)
+    def _indexParsed(self, path: str, sha: str, tex: TeXSource) -> None:
+        self.xrefs.insert(path, sha, tex)
+
+    @Slot(str, str)
+    def _indexFailed(self, path: str, error: str) -> None:
+        self.indexErrors.append(f'Could not index {path}: {error}')
+
+    def stopIndexing(self) -> None:
+        if self.indexThread is not None:
+            self.indexThread.requestInterruption()
+            self.indexThread.quit()
+            self.indexThread.wait()
+
+    def renumberingImpact(self) -> tuple[dict[str, list[str]], list[str]]:
+        edits: dict[str, dict[Section, tuple[bool, list[int]]]] = {}
+        problems = list(self.indexErrors)
+        for path, section, _, proposed in self.amendments:
+            if not path or not section:
+                continue
+            first, *rest = proposed.split('\n')
+            deleted = not first.strip()
+            inserted = [len(m.group(1)) for line in rest
+                        if (m := re.match(r'^\s*(&{1,5})(?!&)', line))]
+            if not deleted and not inserted:
+                continue
+            try:
+                tex = self.source(path)
+                target = tex.sectionToTuple(section)
+            except (KeyError, ValueError, IndexError):
+                target = None
+            if target is None or target not in tex.linenos:
+                problems.append(f'{path} {section} no longer exists')
+                continue
+            edits.setdefault(path, {})[target] = (deleted, inserted)
+        result: dict[str, list[str]] = {}
+        for path, fileEdits in edits.items():
+            locations = self.xrefs.renumberingImpact(path, fileEdits)
+            if locations:
+                result[path] = [self.xrefs.describe(loc) for loc in locations]
+        return result, problems
+
     def headerData(self, section: int, orientation: Qt.Orientation, role: Qt.ItemDataRole = Qt.ItemDataRole.DisplayRole):
         if role not in ROLES:
             return None
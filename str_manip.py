@@ -1,5 +1,5 @@
 import re
-from typing import cast
+from typing import Callable, Iterable, cast
 
 from PySide6.QtGui import QValidator
 
@@ -10,8 +10,20 @@ ROMAN = [
     'xi', 'xii', 'xiii', 'xiv', 'xv',
     'xvi', 'xvii', 'xviii', 'xix', 'xx',
 ]
+LABEL_RE = r'\\label\s*\{([^}]*)\}'
+REF_RE = r'\\(?:ref|autoref|cref|Cref|nameref|pageref|eqref)\*?\s*\{([^}]*)\}'
+SPACE_RE = r'(?:\s|~)'
+# unlike SECTION_RE, a cited number may be a top-level item on its own
+CITED_RE = r'[0-9]+(?:\.[0-9]+(?:\.[1-9][0-9]*(?:\.[a-z](?:\.[ivxlcdm]+)?)?)?)?'
+CITATION_RE = (rf'\b(?i:sections?){SPACE_RE}+(?i:{CITED_RE})'
+               rf'(?:(?:,{SPACE_RE}*|,?{SPACE_RE}+(?i:and|or|to){SPACE_RE}+)(?i:{CITED_RE}))*'
+               rf'(?:{SPACE_RE}+(?i:of){SPACE_RE}+(?:(?i:the){SPACE_RE}+)?'
+               rf'(?P<document>[A-Z][\w\'-]*(?:{SPACE_RE}+(?:[A-Z][\w\'-]*|[0-9]+))*))?')
+TITLE_RE = r'\\title\s*\{([^}]*)\}'
 
 Section = tuple[int, int, int, int, int]
+Location = tuple[str, int] # (path, index into TeXSource.lines)
+DocumentKey = tuple[str, ...]
 
 def texToLines(tex: str) -> list[str]:
     lines = re.split(r'[^\S\n]*\n', tex);
@@ -54,12 +66,52 @@ def sectionsForLines(lines: list[str]) -> list[Section | None]:
             continue # not list item
     return result
 
+def itemDepth(line: str) -> int | None:
+    if line.startswith(r'\section'):
+        return 1
+    if m := re.match(r'^\s*(&+)', line):
+        return len(m.group(1))
+    return None
+
+def documentKey(name: str) -> DocumentKey:
+    # "By-Law 4", "bylaw4" and "Bylaw_4" all become ('bylaw', '4')
+    return tuple(re.findall(r'[a-z]+|[0-9]+', re.sub(r"[-']", '', name.lower())))
+
+def xrefsForLines(lines: list[str]) -> tuple[
+    dict[str, int], dict[str, list[int]],
+    dict[str, list[int]], dict[tuple[DocumentKey, str], list[int]]
+]:
+    labels: dict[str, int] = {}
+    refs: dict[str, list[int]] = {}
+    citations: dict[str, list[int]] = {}
+    qualified: dict[tuple[DocumentKey, str], list[int]] = {}
+    for i, line in enumerate(lines):
+        for m in re.finditer(LABEL_RE, line):
+            labels[m.group(1).strip()] = i
+        for m in re.finditer(REF_RE, line):
+            for label in m.group(1).split(','):
+                refs.setdefault(label.strip(), []).append(i)
+        for m in re.finditer(CITATION_RE, line):
+            numbers = m.group(0)[:m.start('document') - m.start()] if m.group('document') else m.group(0)
+            for n in re.finditer(CITED_RE, numbers, re.I):
+                if m.group('document'):
+                    key = (documentKey(m.group('document')), n.group(0).lower())
+                    qualified.setdefault(key, []).append(i)
+                else:
+                    citations.setdefault(n.group(0).lower(), []).append(i)
+    return labels, refs, citations, qualified
+
 class TeXSource:
 
     tex: str
     lines: list[str]
     linenos: dict[Section, int]
     sections: list[Section | None]
+    labels: dict[str, int]
+    refs: dict[str, list[int]]
+    citations: dict[str, list[int]]
+    qualified: dict[tuple[DocumentKey, str], list[int]]
+    title: str | None = None
     start2: int = 0
 
     def __init__(self, tex: str) -> None:
@@ -69,6 +121,9 @@ class TeXSource:
         self.linenos = {section: i for i, section in enumerate(self.sections)
                         if section is not None}
         self.start2 = 0 if 'Start2=0' in self.tex else 1
+        self.labels, self.refs, self.citations, self.qualified = xrefsForLines(self.lines)
+        if m := re.search(TITLE_RE, self.tex):
+            self.title = m.group(1).strip()
 
     def sectionToTuple(self, section: str) -> Section:
         strTuple = section.strip().strip('.').lower().split('.')
@@ -80,6 +135,123 @@ class TeXSource:
             ROMAN.index(strTuple[4]) if len(strTuple) > 4 else -1
         )
 
+    def tupleToSection(self, section: Section) -> str:
+        parts = [str(section[0])]
+        if section[1] >= 0:
+            parts.append(str(section[1] + self.start2))
+        if section[2] >= 0:
+            parts.append(str(section[2] + 1))
+        if section[3] >= 0:
+            parts.append(chr(section[3] + ord('a')))
+        if section[4] >= 0:
+            parts.append(ROMAN[section[4]])
+        return '.'.join(parts)
+
+    def sectionAt(self, lineno: int) -> Section | None:
+        for section in self.sections[lineno::-1]:
+            if section is not None:
+                return section
+        return None
+
+    def renumbered(self, edits: dict[Section, tuple[bool, list[int]]]) -> set[Section]:
+        # edits maps each amended section to (deleted, depths of inserted items)
+        dropped: set[int] = set()
+        after: dict[int, list[str]] = {}
+        for section, (deleted, inserted) in edits.items():
+            lineno = self.linenos[section]
+            depth = itemDepth(self.lines[lineno]) or 1
+            end = lineno # last line of the item's subtree
+            while end + 1 < len(self.lines) and (itemDepth(self.lines[end+1]) or 0) > depth:
+                end += 1
+            if deleted:
+                dropped.update(range(lineno, end + 1))
+            for newDepth in inserted:
+                after.setdefault(end if newDepth <= depth else lineno, []).append('&' * newDepth)
+        lines: list[str] = []
+        moved: dict[int, int] = {}
+        for i, line in enumerate(self.lines):
+            if i not in dropped:
+                moved[i] = len(lines)
+                lines.append(line)
+            lines.extend(after.get(i, []))
+        sections = sectionsForLines(lines)
+        return {old for i, old in enumerate(self.sections)
+                if old is not None and (i not in moved or sections[moved[i]] != old)}
+
+class CrossReferenceIndex:
+
+    parsed: dict[str, TeXSource] # blob SHA -> parse
+    files: dict[str, str] # path -> blob SHA
+    qualified: dict[tuple[str, str], list[Location]] # (cited path, number) -> citations
+    _dirty: bool = False
+
+    def __init__(self) -> None:
+        self.parsed = {}
+        self.files = {}
+        self.qualified = {}
+
+    def add(self, path: str, sha: str, getTex: Callable[[], str]) -> TeXSource:
+        if sha not in self.parsed:
+            self.parsed[sha] = TeXSource(getTex())
+        return self.insert(path, sha, self.parsed[sha])
+
+    def insert(self, path: str, sha: str, tex: TeXSource) -> TeXSource:
+        self.parsed.setdefault(sha, tex)
+        if self.files.get(path) != sha:
+            self.files[path] = sha
+            self._dirty = True
+        return self.parsed[sha]
+
+    def source(self, path: str) -> TeXSource:
+        return self.parsed[self.files[path]]
+
+    def names(self, path: str) -> set[DocumentKey]:
+        names = {path.rsplit('/', 1)[-1].removesuffix('.tex')}
+        if title := self.source(path).title:
+            names.add(title)
+            names.add(re.split(r'\s+-+\s+|:', title)[0])
+        return {documentKey(name) for name in names} - {()}
+
+    def _aggregate(self) -> None:
+        if not self._dirty:
+            return
+        paths = {name: path for path in self.files for name in self.names(path)}
+        self.qualified = {}
+        for path, sha in self.files.items():
+            for (document, number), lines in self.parsed[sha].qualified.items():
+                # the cited name may run on into the next sentence,
+                # so resolve it to the longest known name it starts with
+                for k in range(len(document), 0, -1):
+                    if document[:k] in paths:
+                        key = (paths[document[:k]], number)
+                        self.qualified.setdefault(key, []).extend((path, i) for i in lines)
+                        break
+        self._dirty = False
+
+    def citing(self, path: str, sections: Iterable[Section]) -> list[Location]:
+        self._aggregate()
+        tex = self.source(path)
+        sections = set(sections)
+        result: set[Location] = set()
+        for number in {tex.tupleToSection(section) for section in sections}:
+            result.update((path, i) for i in tex.citations.get(number, []))
+            result.update(self.qualified.get((path, number), []))
+        for label, i in tex.labels.items():
+            if tex.sectionAt(i) in sections:
+                result.update((path, j) for j in tex.refs.get(label, []))
+        return sorted(result)
+
+    def renumberingImpact(self, path: str, edits: dict[Section, tuple[bool, list[int]]]) -> list[Location]:
+        return self.citing(path, self.source(path).renumbered(edits))
+
+    def describe(self, location: Location) -> str:
+        path, i = location
+        tex = self.source(path)
+        section = tex.sectionAt(i)
+        if section is None:
+            return path
+        return f'{path} {tex.tupleToSection(section)}'
+
 class SectionValidator(QValidator):
     def __init__(self, tex: TeXSource) -> None:
         super().__init__()